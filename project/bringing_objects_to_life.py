@@ -3,7 +3,10 @@
 # - Add customizations using mutator methods (modify the order)
 # - Get order details using accessor methods (read information)
 # - Chain methods together for smooth customization
+# - Share standard drinks between orders with templates (flyweight pattern)
 
+import time
+import tracemalloc
 
 
 class Coffee:
@@ -218,3 +221,344 @@ def compare_two_orders(coffee1, coffee2):
 
     return (price1, price2, more_expensive)
 
+
+# =============================================================================
+# Order Templates (Flyweight)
+# =============================================================================
+
+class CoffeeTemplate:
+    """
+    An immutable standard drink shared by many orders.
+
+    The template is built once: its syrups are stored as a tuple and its
+    price and description are computed a single time and cached, so every
+    order referencing it gets them for free.
+    """
+
+    __slots__ = ("name", "size", "coffee_type", "syrups", "milk_type",
+                 "has_whipped_cream", "base_price", "_price", "_description")
+
+    def __init__(self, name, size, coffee_type, syrups=(), milk_type=None,
+                 has_whipped_cream=False):
+        """
+        Initialize a CoffeeTemplate object.
+
+        Args:
+            name: Name of the standard drink (e.g., "vanilla latte")
+            size: Size of coffee ("small", "medium", or "large")
+            coffee_type: Type of coffee
+            syrups: Syrup flavors in the drink (default none)
+            milk_type: Type of milk (default None)
+            has_whipped_cream: Whether the drink has whipped cream (default False)
+        """
+        prototype = Coffee(size, coffee_type)
+        for syrup in syrups:
+            prototype.add_syrup(syrup)
+        if milk_type is not None:
+            prototype.add_milk(milk_type)
+        if has_whipped_cream:
+            prototype.add_whipped_cream()
+
+        self.name = name
+        self.size = size
+        self.coffee_type = coffee_type
+        self.syrups = tuple(syrups)
+        self.milk_type = milk_type
+        self.has_whipped_cream = has_whipped_cream
+        self.base_price = prototype.base_price
+        self._price = prototype.get_price()
+        self._description = prototype.get_description()
+
+    def get_price(self):
+        """
+        Get the cached price of the standard drink.
+
+        Returns:
+            Total price as float
+        """
+        return self._price
+
+    def get_description(self):
+        """
+        Get the cached description of the standard drink.
+
+        Returns:
+            Description string
+        """
+        return self._description
+
+    def __repr__(self):
+        return f"CoffeeTemplate({self.name!r})"
+
+
+class TemplateOrder:
+    """
+    A coffee order that references a shared CoffeeTemplate.
+
+    The order only stores what differs from its template. Customizations
+    go into a small overlay dict that is created on the first mutator call,
+    so an uncustomized order is just two references. It supports the same
+    mutator and accessor methods as Coffee, including method chaining.
+    """
+
+    __slots__ = ("template", "overlay")
+
+    def __init__(self, template, overlay=None):
+        """
+        Initialize a TemplateOrder object.
+
+        Args:
+            template: The CoffeeTemplate this order is based on
+            overlay: Optional dict of customizations with the keys
+                     "syrups" (list), "milk_type" and "has_whipped_cream"
+        """
+        self.template = template
+        self.overlay = overlay
+
+    def _customize(self, key, value):
+        if self.overlay is None:
+            self.overlay = {}
+        self.overlay[key] = value
+        return self
+
+    def add_syrup(self, syrup_flavor):
+        """
+        Add a syrup on top of the template's syrups (MUTATOR method).
+
+        Args:
+            syrup_flavor: Flavor of syrup to add
+
+        Returns:
+            self (to allow method chaining)
+        """
+        extra = self.overlay.get("syrups") if self.overlay else None
+        if extra is None:
+            return self._customize("syrups", [syrup_flavor])
+        extra.append(syrup_flavor)
+        return self
+
+    def add_milk(self, milk_type):
+        """
+        Set the milk for this order only (MUTATOR method).
+
+        Args:
+            milk_type: Type of milk
+
+        Returns:
+            self (to allow method chaining)
+        """
+        return self._customize("milk_type", milk_type)
+
+    def add_whipped_cream(self):
+        """
+        Add whipped cream to this order only (MUTATOR method).
+
+        Returns:
+            self (to allow method chaining)
+        """
+        return self._customize("has_whipped_cream", True)
+
+    @property
+    def size(self):
+        return self.template.size
+
+    @property
+    def coffee_type(self):
+        return self.template.coffee_type
+
+    @property
+    def base_price(self):
+        return self.template.base_price
+
+    @property
+    def syrups(self):
+        extra = self.overlay.get("syrups") if self.overlay else None
+        if extra:
+            return self.template.syrups + tuple(extra)
+        return self.template.syrups
+
+    @property
+    def milk_type(self):
+        if self.overlay and "milk_type" in self.overlay:
+            return self.overlay["milk_type"]
+        return self.template.milk_type
+
+    @property
+    def has_whipped_cream(self):
+        if self.overlay and "has_whipped_cream" in self.overlay:
+            return self.overlay["has_whipped_cream"]
+        return self.template.has_whipped_cream
+
+    def get_price(self):
+        """
+        Calculate the total price (ACCESSOR method).
+
+        Uncustomized orders return the template's cached price.
+
+        Returns:
+            Total price as float
+        """
+        if not self.overlay:
+            return self.template.get_price()
+        return Coffee.get_price(self)
+
+    def get_description(self):
+        """
+        Get the full description of the order (ACCESSOR method).
+
+        Uncustomized orders return the template's cached description.
+
+        Returns:
+            Description string
+        """
+        if not self.overlay:
+            return self.template.get_description()
+        return Coffee.get_description(self)
+
+    def get_size(self):
+        """
+        Get the size of the coffee (ACCESSOR method).
+
+        Returns:
+            Size string
+        """
+        return self.template.size
+
+    def get_type(self):
+        """
+        Get the type of coffee (ACCESSOR method).
+
+        Returns:
+            Coffee type string
+        """
+        return self.template.coffee_type
+
+    def to_coffee(self):
+        """
+        Build a standalone Coffee object with the same customizations.
+
+        Returns:
+            Coffee object
+        """
+        coffee = Coffee(self.size, self.coffee_type)
+        for syrup in self.syrups:
+            coffee.add_syrup(syrup)
+        coffee.milk_type = self.milk_type
+        coffee.has_whipped_cream = self.has_whipped_cream
+        return coffee
+
+
+class TemplateRegistry:
+    """
+    A registry of standard drinks (template name -> CoffeeTemplate).
+
+    Each standard drink is built once when registered; orders created
+    through the registry share it instead of building a fresh Coffee.
+    """
+
+    def __init__(self):
+        """Initialize an empty TemplateRegistry."""
+        self.templates = {}
+
+    def register(self, name, size, coffee_type, syrups=(), milk_type=None,
+                 has_whipped_cream=False):
+        """
+        Build and register a standard drink.
+
+        Args:
+            name: Name of the standard drink
+            size: Size of coffee
+            coffee_type: Type of coffee
+            syrups: Syrup flavors in the drink (default none)
+            milk_type: Type of milk (default None)
+            has_whipped_cream: Whether the drink has whipped cream (default False)
+
+        Returns:
+            The registered CoffeeTemplate
+        """
+        template = CoffeeTemplate(name, size, coffee_type, syrups,
+                                  milk_type, has_whipped_cream)
+        self.templates[name] = template
+        return template
+
+    def get(self, name):
+        """
+        Get a registered template by name.
+
+        Args:
+            name: Name of the standard drink
+
+        Returns:
+            The CoffeeTemplate
+
+        Raises:
+            KeyError: If no template is registered under name
+        """
+        return self.templates[name]
+
+    def order(self, name):
+        """
+        Create an order for a standard drink.
+
+        Args:
+            name: Name of the standard drink
+
+        Returns:
+            TemplateOrder referencing the shared template
+        """
+        return TemplateOrder(self.templates[name])
+
+    def __contains__(self, name):
+        return name in self.templates
+
+    def __len__(self):
+        return len(self.templates)
+
+
+def benchmark_template_orders(num_orders=100_000):
+    """
+    Compare template orders with building each order from scratch.
+
+    Builds num_orders deluxe coffees with create_deluxe_coffee_with_chaining
+    and the same number of orders through a TemplateRegistry, then prices
+    and describes all of them.
+
+    Args:
+        num_orders: Number of orders to build (default 100,000)
+
+    Returns:
+        Dictionary with "scratch" and "template" entries, each a dict with
+        "build_seconds", "price_seconds" and "peak_bytes"
+    """
+    registry = TemplateRegistry()
+    registry.register("deluxe", "large", "latte", ("vanilla", "caramel"),
+                      "oat", True)
+
+    def measure(build):
+        # Peak memory comes from a separate traced run; tracing slows every
+        # allocation, so the timed run is untraced
+        tracemalloc.start()
+        try:
+            traced = [build() for _ in range(num_orders)]
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del traced
+        start = time.perf_counter()
+        orders = [build() for _ in range(num_orders)]
+        built = time.perf_counter()
+        for order in orders:
+            order.get_price()
+            order.get_description()
+        done = time.perf_counter()
+        return {
+            "build_seconds": built - start,
+            "price_seconds": done - built,
+            "peak_bytes": peak,
+        }
+
+    return {
+        "scratch": measure(lambda: create_deluxe_coffee_with_chaining(
+            "large", "latte", "vanilla", "caramel", "oat")),
+        "template": measure(lambda: registry.order("deluxe")),
+    }
@@ -5,6 +5,19 @@
 # - Use frozensets for locked lineups
 # - Use dicts for artist registries
 # - Understand the += aliasing behavior
+# - Scale lineup operations with hashing, interning and bitsets
+
+import array
+import bisect
+import collections.abc
+import itertools
+import time
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only Roster's array conversions need it
+    np = None
 
 
 # =============================================================================
@@ -109,11 +122,7 @@ def get_headliners(schedule, count):
     Returns:
         List of first N performers
     """
-    # TODO: Use slicing to get the first count performers
-    L = []
-    for i in range(count):
-        L += [schedule[i]]
-    return L
+    return schedule[:max(0, count)]
 
 
 def get_closing_acts(schedule, count):
@@ -127,12 +136,8 @@ def get_closing_acts(schedule, count):
     Returns:
         List of last N performers
     """
-    # TODO: Use negative slicing to get the last count performers
-    L = []
-    for i in range(1, count+1):
-        L += [schedule[-1*i]]
-    L.reverse()
-    return L
+    # A plain schedule[-count:] would return everything for count == 0
+    return schedule[max(0, len(schedule) - count):]
 
 
 def is_performing(schedule, artist):
@@ -146,10 +151,7 @@ def is_performing(schedule, artist):
     Returns:
         True if artist is in schedule, False otherwise
     """
-    # TODO: Check membership using the in operator
-    for e in schedule:
-        if e==artist: return True
-    return False
+    return artist in schedule
 
 
 # =============================================================================
@@ -226,13 +228,11 @@ def is_subset_lineup(small_lineup, full_lineup):
     Returns:
         True if small_lineup is subset of full_lineup
     """
-    # TODO: Check if small_lineup is a subset of full_lineup
-    count = 0
-    for e in small_lineup:
-        for e1 in full_lineup:
-            if e is e1: count+=1
-    if count==len(small_lineup): return True
-    return False
+    # Hash membership: O(len(small) + len(full)) and compares with ==, so
+    # equal-but-not-identical strings match
+    if not isinstance(full_lineup, (set, frozenset)):
+        full_lineup = set(full_lineup)
+    return all(artist in full_lineup for artist in small_lineup)
 
 
 def lock_lineup(artists):
@@ -303,10 +303,8 @@ def is_registered(registry, name):
     Returns:
         True if artist is in registry, False otherwise
     """
-    # TODO: Check if name is a key in the registry
-    for key in registry.keys():
-        if key is name: return True
-    return False
+    # Hash lookup: O(1), and matches equal-but-not-identical strings
+    return name in registry
 
 
 def remove_artist(registry, name):
@@ -410,3 +408,1419 @@ def demonstrate_alias_trap():
     if alias2 == L2: plus_equals_keeps_alias = True
     return (concat_breaks_alias, plus_equals_keeps_alias)
 
+
+# =============================================================================
+# SECTION 6: Interned Artist Universe and Bitset Subset Checks
+# =============================================================================
+
+def _time_call(func, *args, **kwargs):
+    """
+    Time a single call with time.perf_counter.
+    
+    Returns:
+        Tuple (elapsed_seconds, result)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return (time.perf_counter() - start, result)
+
+
+# Positions of the set bits in every byte value, for decoding masks
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+class ArtistUniverse:
+    """
+    Interns artist names to dense integer IDs (0, 1, 2, ...).
+    
+    A lineup can then be encoded once as an integer bitmask with bit i set
+    for artist i, and subset checks between encoded lineups become a single
+    big-int operation: small & ~full == 0.
+    
+    Example:
+        >>> universe = ArtistUniverse()
+        >>> full = universe.encode({"Daft Punk", "Björk", "Muse"})
+        >>> small = universe.encode({"Muse"})
+        >>> universe.is_subset(small, full)
+        True
+    """
+
+    def __init__(self, artists=()):
+        """
+        Initialize an ArtistUniverse object.
+        
+        Args:
+            artists: Artist names to intern up front (default none)
+        """
+        self.ids = {}
+        self.names = []
+        for artist in artists:
+            self.intern(artist)
+
+    def intern(self, artist):
+        """
+        Return the ID of an artist, assigning the next free ID if new.
+        
+        Args:
+            artist: Artist name
+        
+        Returns:
+            Integer ID
+        """
+        artist_id = self.ids.get(artist)
+        if artist_id is None:
+            artist_id = len(self.names)
+            self.ids[artist] = artist_id
+            self.names.append(artist)
+        return artist_id
+
+    def encode(self, lineup):
+        """
+        Encode a collection of artist names as a bitmask, interning new names.
+        
+        Args:
+            lineup: Iterable of artist names
+        
+        Returns:
+            Integer bitmask
+        """
+        intern = self.intern
+        ids = [intern(artist) for artist in lineup]
+        if not ids:
+            return 0
+        # Set the bits in a bytearray and convert once; OR-ing 1 << id into
+        # a growing int would copy the whole mask for every artist
+        bits = bytearray(max(ids) // 8 + 1)
+        for artist_id in ids:
+            bits[artist_id >> 3] |= 1 << (artist_id & 7)
+        return int.from_bytes(bits, "little")
+
+    def decode(self, mask):
+        """
+        Turn a bitmask back into a set of artist names.
+        
+        Args:
+            mask: Integer bitmask from encode
+        
+        Returns:
+            Set of artist names
+        """
+        names = self.names
+        artists = set()
+        # Walk the mask's bytes once; clearing bits one at a time on the int
+        # would copy the whole mask for every artist
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        for index, byte in enumerate(data):
+            if byte:
+                base = index << 3
+                for bit in _BYTE_BITS[byte]:
+                    artists.add(names[base + bit])
+        return artists
+
+    def is_subset(self, small_lineup, full_lineup):
+        """
+        Check if small_lineup is a subset of full_lineup.
+        
+        Either argument may be an encoded bitmask or a collection of names;
+        collections are encoded first. Encode a lineup once and reuse the
+        mask when it is checked repeatedly.
+        
+        Args:
+            small_lineup: Bitmask or collection of artist names
+            full_lineup: Bitmask or collection of artist names
+        
+        Returns:
+            True if every artist in small_lineup is in full_lineup
+        """
+        if not isinstance(small_lineup, int):
+            small_lineup = self.encode(small_lineup)
+        if not isinstance(full_lineup, int):
+            full_lineup = self.encode(full_lineup)
+        return small_lineup & ~full_lineup == 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, artist):
+        return artist in self.ids
+
+
+def _nested_identity_subset(small_lineup, full_lineup):
+    """The original nested-loop identity check, kept for benchmarking."""
+    count = 0
+    for e in small_lineup:
+        for e1 in full_lineup:
+            if e is e1: count+=1
+    return count == len(small_lineup)
+
+
+def benchmark_subset_lineup(size=100_000, loop_size=2_000, repeats=100):
+    """
+    Compare subset checks: nested loop, hash membership and bitsets.
+    
+    The nested loop is O(n * m), so it is timed on loop_size artists only;
+    the other methods use size artists. The small lineup is half the full
+    one. For bitsets, encoding is timed once and then repeats checks are
+    timed per check.
+    
+    Args:
+        size: Artists in the full lineup for hash and bitset (default 100,000)
+        loop_size: Artists in the full lineup for the nested loop (default 2,000)
+        repeats: Number of repeated bitset checks (default 100)
+    
+    Returns:
+        Dictionary of seconds: "nested_loop", "hash", "bitset_encode" and
+        "bitset_check" (per check)
+    """
+    full = {f"artist{i}" for i in range(size)}
+    small = {f"artist{i}" for i in range(0, size, 2)}
+    loop_full = {f"artist{i}" for i in range(loop_size)}
+    loop_small = {f"artist{i}" for i in range(0, loop_size, 2)}
+
+    universe = ArtistUniverse()
+    encode_seconds, (full_mask, small_mask) = _time_call(
+        lambda: (universe.encode(full), universe.encode(small)))
+    check_seconds, _ = _time_call(
+        lambda: [universe.is_subset(small_mask, full_mask) for _ in range(repeats)])
+    return {
+        "nested_loop": _time_call(_nested_identity_subset, loop_small, loop_full)[0],
+        "hash": _time_call(is_subset_lineup, small, full)[0],
+        "bitset_encode": encode_seconds,
+        "bitset_check": check_seconds / repeats,
+    }
+
+
+# =============================================================================
+# SECTION 7: Bitmask Rosters for Stage Set Algebra
+# =============================================================================
+
+class Roster:
+    """
+    A set of artists stored as a bitmask over an ArtistUniverse.
+    
+    Supports the same operators as sets (|, &, -, ^, <=, >=, ==, in, len,
+    iteration), but union, intersection, difference and subset run as
+    word-level big-int operations. Because of that, rosters can be passed
+    straight to get_all_performers, get_crossover_artists,
+    get_exclusive_to_stage, is_subset_lineup and lock_lineup. Rosters being
+    combined must share the same universe.
+    
+    Example:
+        >>> universe = ArtistUniverse()
+        >>> stage1 = Roster.from_names(universe, {"Muse", "Björk"})
+        >>> stage2 = Roster.from_names(universe, {"Muse", "Daft Punk"})
+        >>> get_crossover_artists(stage1, stage2).names()
+        {'Muse'}
+    """
+
+    __slots__ = ("universe", "mask")
+
+    def __init__(self, universe, mask=0):
+        """
+        Initialize a Roster object.
+        
+        Args:
+            universe: The ArtistUniverse that assigns artist IDs
+            mask: Integer bitmask of artist IDs (default empty)
+        """
+        self.universe = universe
+        self.mask = mask
+
+    @classmethod
+    def from_names(cls, universe, artists):
+        """
+        Build a roster from artist names, interning any new names.
+        
+        Args:
+            universe: The ArtistUniverse to use
+            artists: Iterable of artist names
+        
+        Returns:
+            New Roster
+        """
+        return cls(universe, universe.encode(artists))
+
+    @classmethod
+    def from_bool_array(cls, universe, flags):
+        """
+        Build a roster from a NumPy bool array indexed by artist ID.
+        
+        Args:
+            universe: The ArtistUniverse to use
+            flags: 1-D bool array; flags[i] is True if artist i is present
+        
+        Returns:
+            New Roster
+        
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for bool array rosters")
+        packed = np.packbits(np.asarray(flags, dtype=bool), bitorder="little")
+        return cls(universe, int.from_bytes(packed.tobytes(), "little"))
+
+    def to_bool_array(self, length=None):
+        """
+        Return the roster as a NumPy bool array indexed by artist ID.
+        
+        Args:
+            length: Array length (default len(universe))
+        
+        Returns:
+            1-D numpy bool array
+        
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if np is None:
+            raise RuntimeError("NumPy is required for bool array rosters")
+        length = len(self.universe) if length is None else length
+        raw = self.mask.to_bytes((length + 7) // 8, "little")
+        bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), bitorder="little")
+        return bits[:length].astype(bool)
+
+    def names(self):
+        """Return the roster as a set of artist names."""
+        return self.universe.decode(self.mask)
+
+    def _check(self, other):
+        if not isinstance(other, Roster):
+            return NotImplemented
+        if other.universe is not self.universe:
+            raise ValueError("rosters belong to different artist universes")
+        return other.mask
+
+    def __or__(self, other):
+        mask = self._check(other)
+        if mask is NotImplemented:
+            return mask
+        return Roster(self.universe, self.mask | mask)
+
+    def __and__(self, other):
+        mask = self._check(other)
+        if mask is NotImplemented:
+            return mask
+        return Roster(self.universe, self.mask & mask)
+
+    def __sub__(self, other):
+        mask = self._check(other)
+        if mask is NotImplemented:
+            return mask
+        return Roster(self.universe, self.mask & ~mask)
+
+    def __xor__(self, other):
+        mask = self._check(other)
+        if mask is NotImplemented:
+            return mask
+        return Roster(self.universe, self.mask ^ mask)
+
+    def __le__(self, other):
+        mask = self._check(other)
+        if mask is NotImplemented:
+            return mask
+        return self.mask & ~mask == 0
+
+    def __ge__(self, other):
+        mask = self._check(other)
+        if mask is NotImplemented:
+            return mask
+        return mask & ~self.mask == 0
+
+    def __eq__(self, other):
+        if not isinstance(other, Roster):
+            return NotImplemented
+        return self.universe is other.universe and self.mask == other.mask
+
+    def __hash__(self):
+        return hash((id(self.universe), self.mask))
+
+    def __contains__(self, artist):
+        artist_id = self.universe.ids.get(artist)
+        return artist_id is not None and (self.mask >> artist_id) & 1 == 1
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __repr__(self):
+        return f"Roster({sorted(self.names())!r})"
+
+
+def benchmark_rosters(num_artists=10**6, num_stages=10**4, stage_size=1_000, decode_sample=100):
+    """
+    Compare set-of-strings and Roster stage algebra.
+    
+    Builds num_stages stages of stage_size artists drawn from num_artists,
+    then runs union, intersection, difference and subset over every pair of
+    neighbouring stages with both representations. Building rosters is
+    reported separately from the operations, and so is decoding rosters
+    back to names with lock_lineup (which iterates Roster.names()).
+    
+    Each roster operation costs O(num_artists / 64) words however few
+    artists a stage has, while set operations cost O(stage_size). Rosters
+    therefore win once stages hold more than roughly 1 in 1000 of the
+    universe; for very sparse stages plain sets stay faster.
+    
+    Args:
+        num_artists: Size of the artist universe (default 1,000,000)
+        num_stages: Number of stages (default 10,000)
+        stage_size: Artists per stage (default 1,000)
+        decode_sample: Rosters decoded for "roster_decode" (default 100)
+    
+    Returns:
+        Dictionary of seconds: "sets", "rosters", "roster_build", and
+        "set_lock" and "roster_decode" for lock_lineup on decode_sample
+        stages in each representation
+    """
+    names = [f"artist{i}" for i in range(num_artists)]
+    stages = [{names[(stage * 7919 + i * 104729) % num_artists] for i in range(stage_size)}
+              for stage in range(num_stages)]
+    universe = ArtistUniverse(names)
+    build_seconds, rosters = _time_call(
+        lambda: [Roster.from_names(universe, stage) for stage in stages])
+
+    def algebra(lineups):
+        for first, second in zip(lineups, lineups[1:]):
+            get_all_performers(first, second)
+            get_crossover_artists(first, second)
+            get_exclusive_to_stage(first, second)
+            first <= second
+
+    def lock_all(lineups):
+        return [lock_lineup(lineup) for lineup in lineups[:decode_sample]]
+
+    return {
+        "sets": _time_call(algebra, stages)[0],
+        "rosters": _time_call(algebra, rosters)[0],
+        "roster_build": build_seconds,
+        "set_lock": _time_call(lock_all, stages)[0],
+        "roster_decode": _time_call(lock_all, rosters)[0],
+    }
+
+
+# =============================================================================
+# SECTION 8: Indexed Artist Registry
+# =============================================================================
+
+_MISSING = object()
+
+
+class ArtistRegistry(collections.abc.MutableMapping):
+    """
+    An artist registry (artist name -> stage) with secondary indexes.
+    
+    Wraps the dictionary from create_artist_registry and keeps two extra
+    indexes in sync with it:
+    - a stage -> set of artists reverse index, updated on every change
+    - a sorted list of names for prefix (autocomplete) queries, updated
+      lazily: names added or removed since the last query are kept in two
+      sets (an add and a remove of the same name cancel out, so they never
+      hold more than the net change); small batches are applied with
+      bisect, large ones trigger one re-sort
+    
+    It works with register_artist, get_artist_stage, is_registered and
+    remove_artist unchanged.
+    
+    Example:
+        >>> registry = ArtistRegistry(create_artist_registry())
+        >>> register_artist(registry, "Muse", "Main")
+        >>> register_artist(registry, "Mumford & Sons", "Tent")
+        >>> registry.autocomplete("Mu")
+        ['Mumford & Sons', 'Muse']
+        >>> registry.artists_on_stage("Main")
+        {'Muse'}
+    """
+
+    def __init__(self, registry=None):
+        """
+        Initialize an ArtistRegistry object.
+        
+        Args:
+            registry: Existing name -> stage dict to wrap (default a new
+                      create_artist_registry() dict)
+        """
+        self.data = create_artist_registry() if registry is None else registry
+        self.by_stage = {}
+        for name, stage in self.data.items():
+            self.by_stage.setdefault(stage, set()).add(name)
+        self._sorted_names = sorted(self.data)
+        self._added = set()
+        self._removed = set()
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    def __setitem__(self, name, stage):
+        old_stage = self.data.get(name, _MISSING)
+        if old_stage is _MISSING:
+            if name in self._removed:
+                self._removed.discard(name)
+            else:
+                self._added.add(name)
+        else:
+            self._unindex_stage(name, old_stage)
+        self.data[name] = stage
+        self.by_stage.setdefault(stage, set()).add(name)
+
+    def __delitem__(self, name):
+        stage = self.data.pop(name)
+        self._unindex_stage(name, stage)
+        if name in self._added:
+            self._added.discard(name)
+        else:
+            self._removed.add(name)
+
+    def _unindex_stage(self, name, stage):
+        artists = self.by_stage[stage]
+        artists.discard(name)
+        if not artists:
+            del self.by_stage[stage]
+
+    def __contains__(self, name):
+        return name in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def artists_on_stage(self, stage):
+        """
+        Return the artists registered to a stage.
+        
+        Args:
+            stage: Stage name/number
+        
+        Returns:
+            New set of artist names (empty if the stage has none)
+        """
+        return set(self.by_stage.get(stage, ()))
+
+    def stages(self):
+        """Return the set of stages that have at least one artist."""
+        return set(self.by_stage)
+
+    def _refresh_sorted_names(self):
+        pending = len(self._added) + len(self._removed)
+        if not pending:
+            return
+        names = self._sorted_names
+        if pending > 64 and pending * 16 > len(names):
+            self._sorted_names = sorted(self.data)
+        else:
+            for name in self._removed:
+                del names[bisect.bisect_left(names, name)]
+            for name in self._added:
+                names.insert(bisect.bisect_left(names, name), name)
+        self._added = set()
+        self._removed = set()
+
+    def autocomplete(self, prefix, limit=None):
+        """
+        Return registered names starting with prefix, in sorted order.
+        
+        Uses binary search over the sorted names: O(log n + matches).
+        
+        Args:
+            prefix: Beginning of the artist name
+            limit: Maximum number of names to return (default all)
+        
+        Returns:
+            List of matching artist names
+        """
+        self._refresh_sorted_names()
+        names = self._sorted_names
+        start = bisect.bisect_left(names, prefix)
+        matches = []
+        for index in range(start, len(names)):
+            name = names[index]
+            if not name.startswith(prefix) or (limit is not None and len(matches) >= limit):
+                break
+            matches.append(name)
+        return matches
+
+    def __repr__(self):
+        return f"ArtistRegistry({self.data!r})"
+
+
+def _is_registered_by_scan(registry, name):
+    """The original linear identity scan, kept for benchmarking."""
+    for key in registry.keys():
+        if key is name: return True
+    return False
+
+
+def benchmark_artist_registry(size=1_000_000, lookups=1_000, scans=5):
+    """
+    Compare ArtistRegistry lookups with the original linear key scan.
+    
+    The scan is timed on names near the end of the registry, its worst
+    case. Pass size=10**7 for the full-size run (needs several GB of RAM).
+    
+    Args:
+        size: Number of registered artists (default 1,000,000)
+        lookups: Membership, stage and prefix queries to time (default 1,000)
+        scans: Linear scan lookups to time, as they are slow (default 5)
+    
+    Returns:
+        Dictionary of seconds: "build", and per-query "scan_lookup",
+        "lookup", "autocomplete" and "stage_lookup"
+    """
+    names = [f"artist{i:08d}" for i in range(size)]
+    build_seconds, registry = _time_call(
+        lambda: ArtistRegistry({name: f"stage{i % 100}" for i, name in enumerate(names)}))
+    probes = [names[(i * 7919) % size] for i in range(lookups)]
+    scan_count = min(scans, size)
+    scan_seconds, _ = _time_call(
+        lambda: [_is_registered_by_scan(registry.data, names[size - 1 - i])
+                 for i in range(scan_count)])
+    return {
+        "build": build_seconds,
+        "scan_lookup": scan_seconds / max(1, scan_count),
+        "lookup": _time_call(lambda: [is_registered(registry, n) for n in probes])[0] / lookups,
+        "autocomplete": _time_call(
+            lambda: [registry.autocomplete(n[:-2], limit=10) for n in probes])[0] / lookups,
+        "stage_lookup": _time_call(
+            lambda: [registry.by_stage.get(f"stage{i % 100}") for i in range(lookups)])[0] / lookups,
+    }
+
+
+# =============================================================================
+# SECTION 9: Indexed Schedule
+# =============================================================================
+
+class Schedule:
+    """
+    An append-only performance schedule with a hash index of positions.
+    
+    Keeps acts in insertion order in a list plus a dict mapping each act
+    to its first position (repeat appearances are kept separately), so
+    membership and position lookups are O(1) while appending stays
+    amortized O(1). Slicing returns plain lists. It works with
+    add_to_schedule, get_headliners, get_closing_acts and is_performing
+    unchanged.
+    
+    Example:
+        >>> schedule = Schedule(["Muse", "Björk"])
+        >>> add_to_schedule(schedule, "Daft Punk")
+        >>> is_performing(schedule, "Björk"), schedule.position("Daft Punk")
+        (True, 2)
+        >>> get_closing_acts(schedule, 2)
+        ['Björk', 'Daft Punk']
+    """
+
+    __slots__ = ("acts", "first_positions", "repeat_positions")
+
+    def __init__(self, acts=()):
+        """
+        Initialize a Schedule object.
+        
+        Args:
+            acts: Initial performers in order (default none)
+        """
+        self.acts = []
+        self.first_positions = {}
+        self.repeat_positions = {}
+        self.extend(acts)
+
+    def append(self, performer):
+        """Add a performer to the end of the schedule."""
+        self.extend((performer,))
+
+    def extend(self, performers):
+        """Add every performer from an iterable to the end of the schedule."""
+        acts = self.acts
+        first_positions = self.first_positions
+        position = len(acts)
+        for performer in performers:
+            acts.append(performer)
+            if first_positions.setdefault(performer, position) != position:
+                self.repeat_positions.setdefault(performer, []).append(position)
+            position += 1
+
+    def __iadd__(self, performers):
+        self.extend(performers)
+        return self
+
+    def __contains__(self, performer):
+        return performer in self.first_positions
+
+    def position(self, performer):
+        """
+        Return the first position of a performer in the schedule.
+        
+        Raises:
+            ValueError: If performer is not in the schedule
+        """
+        position = self.first_positions.get(performer)
+        if position is None:
+            raise ValueError(f"{performer!r} is not in the schedule")
+        return position
+
+    def all_positions(self, performer):
+        """Return every position of a performer (empty list if absent)."""
+        if performer not in self.first_positions:
+            return []
+        return [self.first_positions[performer]] + self.repeat_positions.get(performer, [])
+
+    def headliners(self, count):
+        """Return the first count performers as a list slice."""
+        return self.acts[:max(0, count)]
+
+    def closing_acts(self, count):
+        """Return the last count performers as a list slice."""
+        return self.acts[max(0, len(self.acts) - count):]
+
+    def __getitem__(self, index):
+        return self.acts[index]
+
+    def __len__(self):
+        return len(self.acts)
+
+    def __iter__(self):
+        return iter(self.acts)
+
+    def __repr__(self):
+        return f"Schedule({self.acts!r})"
+
+
+def _is_performing_by_scan(schedule, artist):
+    """The original linear membership scan, kept for benchmarking."""
+    for e in schedule:
+        if e==artist: return True
+    return False
+
+
+def _headliners_by_loop(schedule, count):
+    """The original item-by-item headliner loop, kept for benchmarking."""
+    L = []
+    for i in range(count):
+        L += [schedule[i]]
+    return L
+
+
+def benchmark_schedule(size=1_000_000, queries=100, count=10_000):
+    """
+    Compare a plain list schedule with the indexed Schedule.
+    
+    Args:
+        size: Number of schedule slots (default 1,000,000)
+        queries: Membership/position queries to time (default 100)
+        count: Headliners to fetch (default 10,000)
+    
+    Returns:
+        Dictionary of seconds: "list_build", "schedule_build",
+        "scan_membership" and "indexed_membership" (per query),
+        "position_lookup" (per query), "loop_headliners", "slice_headliners"
+    """
+    acts = [f"act{i}" for i in range(size)]
+    probes = [acts[size - 1 - (i * 7919) % size] for i in range(queries)]
+
+    def build(schedule):
+        for act in acts:
+            add_to_schedule(schedule, act)
+        return schedule
+
+    list_seconds, plain = _time_call(build, create_schedule())
+    schedule_seconds, indexed = _time_call(build, Schedule())
+    return {
+        "list_build": list_seconds,
+        "schedule_build": schedule_seconds,
+        "scan_membership": _time_call(
+            lambda: [_is_performing_by_scan(plain, a) for a in probes])[0] / queries,
+        "indexed_membership": _time_call(
+            lambda: [is_performing(indexed, a) for a in probes])[0] / queries,
+        "position_lookup": _time_call(
+            lambda: [indexed.position(a) for a in probes])[0] / queries,
+        "loop_headliners": _time_call(_headliners_by_loop, plain, count)[0],
+        "slice_headliners": _time_call(get_headliners, indexed, count)[0],
+    }
+
+
+# =============================================================================
+# SECTION 10: Bulk Column Parsers
+# =============================================================================
+
+def _column_rows(column):
+    """Split a bytes buffer into lines; pass lists of strings through."""
+    if isinstance(column, (bytes, bytearray, memoryview)):
+        return bytes(column).splitlines()
+    if isinstance(column, str):
+        return column.splitlines()
+    return column if isinstance(column, list) else list(column)
+
+
+def _parse_column(rows, convert, typecode, fill, as_numpy, *args):
+    """Convert every row with convert(row, *args), flagging failures."""
+    try:
+        # A clean column converts in one map pass; only a column with a bad
+        # row is redone row by row to find and flag the failures
+        values = array.array(typecode, map(convert, rows, *map(itertools.repeat, args)))
+        errors = bytearray(len(rows))
+    except (TypeError, ValueError, OverflowError):
+        values = array.array(typecode, bytes(len(rows) * array.array(typecode).itemsize))
+        errors = bytearray(len(rows))
+        for index, row in enumerate(rows):
+            try:
+                values[index] = convert(row, *args)
+            except (TypeError, ValueError, OverflowError):
+                values[index] = fill
+                errors[index] = 1
+    if as_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is required for as_numpy=True")
+        return (np.frombuffer(values, dtype=typecode).copy(),
+                np.frombuffer(errors, dtype=np.uint8).astype(bool))
+    return (values, errors)
+
+
+def parse_ticket_prices(column, as_numpy=False):
+    r"""
+    Parse a whole column of ticket prices at once.
+    
+    Column version of parse_ticket_price: bad rows do not raise, they are
+    flagged in an error mask and stored as NaN. Every row still goes
+    through float(), so throughput is about the same as calling
+    parse_ticket_price per row (a bytes buffer is a little slower, since
+    it is split into lines first); the gain is the error mask and compact
+    array storage, not speed.
+    
+    Args:
+        column: bytes buffer or str with one price per line, or a list
+                (or iterable) of strings
+        as_numpy: Return NumPy arrays instead of array.array/bytearray
+                  (default False)
+    
+    Returns:
+        Tuple (prices, errors): prices is array.array("d") (or a float64
+        ndarray); errors is a bytearray with 1 for rows that failed to
+        parse (or a bool ndarray)
+    
+    Example:
+        >>> prices, errors = parse_ticket_prices(b"25\n29.99\nfree\n")
+        >>> list(prices[:2]), list(errors)
+        ([25.0, 29.99], [0, 0, 1])
+    """
+    return _parse_column(_column_rows(column), float, "d", float("nan"), as_numpy)
+
+
+def parse_stage_numbers(column, base=10, as_numpy=False):
+    """
+    Parse a whole column of stage numbers at once.
+    
+    Column version of parse_stage_number: bad rows (or values outside the
+    int64 range) do not raise, they are flagged in an error mask and
+    stored as 0. Every row still goes through int(row, base), so
+    throughput is about the same as calling parse_stage_number per row.
+    
+    Args:
+        column: bytes buffer or str with one number per line, or a list
+                (or iterable) of strings
+        base: The base to parse, e.g. 2, 8, 10 or 16 (default 10)
+        as_numpy: Return NumPy arrays instead of array.array/bytearray
+                  (default False)
+    
+    Returns:
+        Tuple (numbers, errors): numbers is array.array("q") (or an int64
+        ndarray); errors is a bytearray with 1 for rows that failed to
+        parse (or a bool ndarray)
+    """
+    return _parse_column(_column_rows(column), int, "q", 0, as_numpy, base)
+
+
+def benchmark_column_parsers(rows=1_000_000, bad_every=100):
+    """
+    Compare column parsers with calling the scalar parsers per row.
+    
+    Both call float()/int() once per row, so expect similar rows per
+    second; the bytes-buffer run also pays for splitting the buffer.
+    
+    Args:
+        rows: Number of rows (default 1,000,000)
+        bad_every: Every bad_every-th row is invalid in the "dirty" runs
+                   (default 100)
+    
+    Returns:
+        Dictionary mapping run name to rows per second
+    """
+    prices = [f"{i * 0.37:.2f}" for i in range(rows)]
+    stages = [format(i % 4096, "x") for i in range(rows)]
+    dirty_prices = [p if i % bad_every else "n/a" for i, p in enumerate(prices)]
+    price_buffer = "\n".join(prices).encode()
+
+    def scalar_prices(column):
+        return [parse_ticket_price(row) for row in column]
+
+    def scalar_stages(column):
+        return [parse_stage_number(row, 16) for row in column]
+
+    cases = {
+        "scalar_prices": lambda: scalar_prices(prices),
+        "column_prices": lambda: parse_ticket_prices(prices),
+        "column_prices_bytes": lambda: parse_ticket_prices(price_buffer),
+        "column_prices_dirty": lambda: parse_ticket_prices(dirty_prices),
+        "scalar_stages_hex": lambda: scalar_stages(stages),
+        "column_stages_hex": lambda: parse_stage_numbers(stages, 16),
+    }
+    return {name: rows / _time_call(run)[0] for name, run in cases.items()}
+
+
+# =============================================================================
+# SECTION 11: Copy-on-Write Lineups
+# =============================================================================
+
+class _SharedStorage:
+    """A list plus the number of CowLineup objects using it."""
+
+    __slots__ = ("items", "users")
+
+    def __init__(self, items):
+        self.items = items
+        self.users = 1
+
+
+class CowLineup(collections.abc.MutableSequence):
+    """
+    A list-like lineup whose copies share storage until they are modified.
+    
+    lineup[:] (and so share_lineup_copy) and copy() return a new CowLineup
+    in O(1) that shares the same underlying list. The first mutation of a
+    lineup whose storage is shared (append, +=, item assignment, del, ...)
+    gives that lineup its own copy first, so the other copies never see it.
+    
+    Aliases are unaffected: share_lineup_alias still returns the same
+    object, + still builds a new lineup and += still modifies in place, so
+    demonstrate_alias_trap's behavior holds. A lineup that was copied and
+    whose copies were later discarded may still copy once on its next
+    mutation, since dropped copies are not tracked.
+    
+    Example:
+        >>> original = CowLineup(["Muse", "Björk"])
+        >>> copy = share_lineup_copy(original)
+        >>> copy += ["Daft Punk"]
+        >>> list(original), list(copy)
+        (['Muse', 'Björk'], ['Muse', 'Björk', 'Daft Punk'])
+    """
+
+    __slots__ = ("_storage",)
+
+    def __init__(self, artists=()):
+        """
+        Initialize a CowLineup object.
+        
+        Args:
+            artists: Initial artists (copied into new storage)
+        """
+        self._storage = _SharedStorage(list(artists))
+
+    def copy(self):
+        """Return an O(1) copy that shares storage until either side mutates."""
+        clone = CowLineup.__new__(CowLineup)
+        clone._storage = self._storage
+        self._storage.users += 1
+        return clone
+
+    def _writable(self):
+        storage = self._storage
+        if storage.users > 1:
+            storage.users -= 1
+            storage = self._storage = _SharedStorage(storage.items[:])
+        return storage.items
+
+    def is_shared(self):
+        """Return True if this lineup currently shares storage with a copy."""
+        return self._storage.users > 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index == slice(None):
+                return self.copy()
+            return CowLineup(self._storage.items[index])
+        return self._storage.items[index]
+
+    def __setitem__(self, index, artist):
+        self._writable()[index] = artist
+
+    def __delitem__(self, index):
+        del self._writable()[index]
+
+    def __len__(self):
+        return len(self._storage.items)
+
+    def __iter__(self):
+        return iter(self._storage.items)
+
+    def __contains__(self, artist):
+        return artist in self._storage.items
+
+    def insert(self, index, artist):
+        """Insert an artist before index."""
+        self._writable().insert(index, artist)
+
+    def append(self, artist):
+        """Add an artist to the end."""
+        self._writable().append(artist)
+
+    def extend(self, artists):
+        """Add every artist from an iterable to the end."""
+        self._writable().extend(artists)
+
+    def __iadd__(self, artists):
+        self.extend(artists)
+        return self
+
+    def __add__(self, artists):
+        if isinstance(artists, CowLineup):
+            artists = artists._storage.items
+        return CowLineup(self._storage.items + list(artists))
+
+    def __eq__(self, other):
+        if isinstance(other, CowLineup):
+            return self._storage.items == other._storage.items
+        if isinstance(other, list):
+            return self._storage.items == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CowLineup({self._storage.items!r})"
+
+
+def _measure_peak(func, *args, **kwargs):
+    """
+    Measure the peak traced memory of a single call.
+    
+    Returns:
+        Tuple (peak_bytes, result)
+    """
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (peak, result)
+
+
+def benchmark_cow_lineup(size=100_000, copies=1_000, modified_every=100):
+    """
+    Compare read-mostly copies of a list lineup and a CowLineup.
+    
+    Makes copies copies of a size-artist lineup with share_lineup_copy,
+    reads an item from each, and appends to every modified_every-th copy.
+    The full-size run (size=10**6, copies=10**4) needs about 80 GB with
+    plain lists, so the defaults are smaller.
+    
+    Args:
+        size: Artists in the lineup (default 100,000)
+        copies: Number of copies (default 1,000)
+        modified_every: Every modified_every-th copy is appended to (default 100)
+    
+    Returns:
+        Dictionary mapping "list" and "cow" to a dict with "seconds" and
+        "peak_bytes"
+    """
+    artists = [f"artist{i}" for i in range(size)]
+
+    def make_copies(original):
+        kept = []
+        for index in range(copies):
+            copy = share_lineup_copy(original)
+            copy[index % size]
+            if index % modified_every == 0:
+                copy += ["Encore"]
+            kept.append(copy)
+        return kept
+
+    results = {}
+    for name, original in (("list", list(artists)), ("cow", CowLineup(artists))):
+        seconds, _ = _time_call(make_copies, original)
+        peak, _ = _measure_peak(make_copies, original)
+        results[name] = {"seconds": seconds, "peak_bytes": peak}
+    return results
+
+
+# =============================================================================
+# SECTION 12: Persistent Lineup Versions (Hash Array Mapped Trie)
+# =============================================================================
+
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_LEVEL_BITS = 5
+_LEVEL_MASK = (1 << _LEVEL_BITS) - 1
+
+
+class _TrieNode:
+    """
+    A trie node: a 32-bit bitmap of used slots plus a compact entries tuple.
+    
+    An entry is either a leaf (hash, artist) tuple or a child node.
+    """
+
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _CollisionNode:
+    """Artists whose full 64-bit hashes are equal."""
+
+    __slots__ = ("hash", "artists")
+
+    def __init__(self, artist_hash, artists):
+        self.hash = artist_hash
+        self.artists = artists
+
+
+_EMPTY_NODE = _TrieNode(0, ())
+
+
+def _entry_hash(entry):
+    return entry[0] if type(entry) is tuple else entry.hash
+
+
+def _join(shift, first, second):
+    """Build the smallest subtree holding two entries with different paths."""
+    first_hash = _entry_hash(first)
+    second_hash = _entry_hash(second)
+    if first_hash == second_hash:
+        return _CollisionNode(first_hash, (first[1], second[1]))
+    first_slot = (first_hash >> shift) & _LEVEL_MASK
+    second_slot = (second_hash >> shift) & _LEVEL_MASK
+    if first_slot == second_slot:
+        return _TrieNode(1 << first_slot, (_join(shift + _LEVEL_BITS, first, second),))
+    if first_slot > second_slot:
+        first, second = second, first
+    return _TrieNode((1 << first_slot) | (1 << second_slot), (first, second))
+
+
+def _trie_add(node, shift, artist_hash, artist):
+    """Return (new_node, added); new_node is node itself if nothing changed."""
+    if type(node) is _CollisionNode:
+        if artist_hash != node.hash:
+            return (_join(shift, node, (artist_hash, artist)), True)
+        if artist in node.artists:
+            return (node, False)
+        return (_CollisionNode(node.hash, node.artists + (artist,)), True)
+    bit = 1 << ((artist_hash >> shift) & _LEVEL_MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    if not node.bitmap & bit:
+        return (_TrieNode(node.bitmap | bit,
+                          entries[:index] + ((artist_hash, artist),) + entries[index:]), True)
+    entry = entries[index]
+    if type(entry) is tuple:
+        if entry[0] == artist_hash and (entry[1] is artist or entry[1] == artist):
+            return (node, False)
+        child = _join(shift + _LEVEL_BITS, entry, (artist_hash, artist))
+    else:
+        child, added = _trie_add(entry, shift + _LEVEL_BITS, artist_hash, artist)
+        if not added:
+            return (node, False)
+    return (_TrieNode(node.bitmap, entries[:index] + (child,) + entries[index + 1:]), True)
+
+
+def _trie_remove(node, shift, artist_hash, artist):
+    """
+    Return the node without artist.
+    
+    Returns node itself if artist is absent, None if the node became empty,
+    or a leaf tuple if only one artist is left below it (so the parent can
+    pull the leaf up and keep the trie compact).
+    """
+    if type(node) is _CollisionNode:
+        if artist_hash != node.hash or artist not in node.artists:
+            return node
+        remaining = tuple(a for a in node.artists if a != artist)
+        if len(remaining) == 1:
+            return (node.hash, remaining[0])
+        return _CollisionNode(node.hash, remaining)
+    bit = 1 << ((artist_hash >> shift) & _LEVEL_MASK)
+    if not node.bitmap & bit:
+        return node
+    index = (node.bitmap & (bit - 1)).bit_count()
+    entries = node.entries
+    entry = entries[index]
+    if type(entry) is tuple:
+        if entry[0] != artist_hash or not (entry[1] is artist or entry[1] == artist):
+            return node
+        child = None
+    else:
+        child = _trie_remove(entry, shift + _LEVEL_BITS, artist_hash, artist)
+        if child is entry:
+            return node
+    if child is None:
+        if node.bitmap == bit:
+            return None
+        entries = entries[:index] + entries[index + 1:]
+        if len(entries) == 1 and type(entries[0]) is tuple and shift:
+            return entries[0]
+        return _TrieNode(node.bitmap & ~bit, entries)
+    if type(child) is tuple and len(entries) == 1 and shift:
+        return child
+    return _TrieNode(node.bitmap, entries[:index] + (child,) + entries[index + 1:])
+
+
+def _trie_iter(node):
+    if type(node) is _CollisionNode:
+        yield from node.artists
+        return
+    for entry in node.entries:
+        if type(entry) is tuple:
+            yield entry[1]
+        else:
+            yield from _trie_iter(entry)
+
+
+def _trie_find(node, artist_hash, artist):
+    shift = 0
+    while True:
+        if type(node) is _CollisionNode:
+            return artist_hash == node.hash and artist in node.artists
+        bit = 1 << ((artist_hash >> shift) & _LEVEL_MASK)
+        if not node.bitmap & bit:
+            return False
+        entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+        if type(entry) is tuple:
+            return entry[0] == artist_hash and (entry[1] is artist or entry[1] == artist)
+        node = entry
+        shift += _LEVEL_BITS
+
+
+class PersistentLineup:
+    """
+    An immutable set of artists where each new version shares structure.
+    
+    Stored as a hash array mapped trie (32-way branching on 5 bits of the
+    artist's hash per level). add and discard return a new lineup that
+    copies only the O(log32 n) nodes on the path to the artist and shares
+    everything else with the previous version, so keeping many versions
+    costs memory per change instead of per artist. Like a frozenset it is
+    hashable and works with lock_lineup, is_subset_lineup and set
+    operators against other iterables.
+    
+    Example:
+        >>> v1 = PersistentLineup(["Muse", "Björk"])
+        >>> v2 = v1.add("Daft Punk").discard("Muse")
+        >>> sorted(v1), sorted(v2)
+        (['Björk', 'Muse'], ['Björk', 'Daft Punk'])
+    """
+
+    __slots__ = ("_root", "_size", "_hash")
+
+    def __init__(self, artists=()):
+        """
+        Initialize a PersistentLineup object.
+        
+        Args:
+            artists: Initial artist names (duplicates are ignored)
+        """
+        root = _EMPTY_NODE
+        size = 0
+        for artist in artists:
+            root, added = _trie_add(root, 0, hash(artist) & _HASH_MASK, artist)
+            size += added
+        self._root = root
+        self._size = size
+        self._hash = None
+
+    @classmethod
+    def _from_root(cls, root, size):
+        lineup = cls.__new__(cls)
+        lineup._root = _EMPTY_NODE if root is None else root
+        lineup._size = size
+        lineup._hash = None
+        return lineup
+
+    def add(self, artist):
+        """
+        Return a new version with artist added (self if already present).
+        """
+        root, added = _trie_add(self._root, 0, hash(artist) & _HASH_MASK, artist)
+        return PersistentLineup._from_root(root, self._size + 1) if added else self
+
+    def discard(self, artist):
+        """
+        Return a new version without artist (self if it was absent).
+        """
+        root = _trie_remove(self._root, 0, hash(artist) & _HASH_MASK, artist)
+        if root is self._root:
+            return self
+        return PersistentLineup._from_root(root, self._size - 1)
+
+    def remove(self, artist):
+        """
+        Return a new version without artist.
+        
+        Raises:
+            KeyError: If artist is not in the lineup
+        """
+        result = self.discard(artist)
+        if result is self:
+            raise KeyError(artist)
+        return result
+
+    def update(self, added=(), removed=()):
+        """
+        Return a new version with several artists added and removed.
+        
+        Args:
+            added: Artists to add
+            removed: Artists to remove (applied after the additions)
+        
+        Returns:
+            New PersistentLineup (self if nothing changed)
+        """
+        lineup = self
+        for artist in added:
+            lineup = lineup.add(artist)
+        for artist in removed:
+            lineup = lineup.discard(artist)
+        return lineup
+
+    def __contains__(self, artist):
+        return _trie_find(self._root, hash(artist) & _HASH_MASK, artist)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return _trie_iter(self._root)
+
+    def __or__(self, artists):
+        return self.update(added=artists)
+
+    def __sub__(self, artists):
+        return self.update(removed=artists)
+
+    def __le__(self, other):
+        return is_subset_lineup(self, other)
+
+    def __eq__(self, other):
+        if isinstance(other, PersistentLineup):
+            if self._root is other._root:
+                return True
+            return len(self) == len(other) and all(artist in other for artist in self)
+        if isinstance(other, (set, frozenset)):
+            return len(self) == len(other) and all(artist in other for artist in self)
+        return NotImplemented
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self))
+        return self._hash
+
+    def to_frozenset(self):
+        """Return the current version as a frozenset."""
+        return frozenset(self)
+
+    def __repr__(self):
+        return f"PersistentLineup({sorted(self, key=str)!r})"
+
+
+class LineupHistory:
+    """
+    Every version of a festival lineup, sharing structure between versions.
+    
+    Example:
+        >>> history = LineupHistory(["Muse"])
+        >>> _ = history.commit(added=["Björk"])
+        >>> len(history), sorted(history[0]), sorted(history[-1])
+        (2, ['Muse'], ['Björk', 'Muse'])
+    """
+
+    def __init__(self, artists=()):
+        """
+        Initialize a LineupHistory with a first version.
+        
+        Args:
+            artists: Artists in the first version
+        """
+        self.versions = [PersistentLineup(artists)]
+
+    def commit(self, added=(), removed=()):
+        """
+        Record a new version based on the latest one.
+        
+        Args:
+            added: Artists to add
+            removed: Artists to remove
+        
+        Returns:
+            The new PersistentLineup version
+        """
+        version = self.versions[-1].update(added, removed)
+        self.versions.append(version)
+        return version
+
+    def latest(self):
+        """Return the most recent version."""
+        return self.versions[-1]
+
+    def __getitem__(self, index):
+        return self.versions[index]
+
+    def __len__(self):
+        return len(self.versions)
+
+
+def benchmark_lineup_versions(size=100_000, versions=10_000, frozenset_versions=100):
+    """
+    Compare memory per version of frozenset copies and PersistentLineup.
+    
+    Each version adds one new artist and removes one existing artist. The
+    frozenset approach (lock_lineup on every version) is only run for
+    frozenset_versions versions because it needs O(size) memory each;
+    both results are reported per version.
+    
+    Args:
+        size: Artists in the lineup (default 100,000)
+        versions: Versions to keep for PersistentLineup (default 10,000)
+        frozenset_versions: Versions to keep for frozensets (default 100)
+    
+    Returns:
+        Dictionary mapping "frozenset" and "persistent" to a dict with
+        "seconds_per_version" and "bytes_per_version"
+    """
+    artists = [f"artist{i}" for i in range(size)]
+    initial = set(artists)
+
+    def frozen_history(current, count):
+        history = []
+        for i in range(count):
+            current.add(f"new{i}")
+            current.discard(artists[i % size])
+            history.append(lock_lineup(current))
+        return history
+
+    def persistent_history(lineup, count):
+        history = []
+        for i in range(count):
+            lineup = lineup.add(f"new{i}").discard(artists[i % size])
+            history.append(lineup)
+        return history
+
+    # The first version is built outside the measured calls, so only the
+    # cost of the later versions is counted
+    first = PersistentLineup(artists)
+    results = {}
+    for name, build, start, count in (
+            ("frozenset", frozen_history, lambda: set(initial), frozenset_versions),
+            ("persistent", persistent_history, lambda: first, versions)):
+        seconds, _ = _time_call(build, start(), count)
+        peak, _ = _measure_peak(build, start(), count)
+        results[name] = {
+            "seconds_per_version": seconds / max(1, count),
+            "bytes_per_version": peak / max(1, count),
+        }
+    return results